@@ -15,6 +15,8 @@ class DiffTreeRequest(BaseModel):
     base_branch: str
     compare_branch: str
     tree_mode: str = Field(default="flat")
+    # Report formatting-only changes as "reformatted" without a diff.
+    skip_reformatted: bool = Field(default=False)
 
 
 app = FastAPI(title="Backend API")
@@ -50,7 +52,11 @@ async def diff_tree(payload: DiffTreeRequest) -> list[ProjectTreeNode]:
 
     try:
         tree = diff_to_tree(
-            payload.repo_path, payload.base_branch, payload.compare_branch, payload.tree_mode
+            payload.repo_path,
+            payload.base_branch,
+            payload.compare_branch,
+            payload.tree_mode,
+            skip_reformatted=payload.skip_reformatted,
         )
     except ValueError as exc:
         # Surface a clear 400 error when the path is not a valid git repository
@@ -0,0 +1,271 @@
+"""
+Headless batch computation of diff trees.
+
+Reads a list of jobs (repository path + base/compare branch) and computes
+the diff tree for each one on a process pool, without going through the
+FastAPI app. Intended for CI and nightly review reports.
+
+Jobs are read from a JSON array or from NDJSON (one object per line)::
+
+    {"repo_path": "/repos/app", "base_branch": "main", "compare_branch": "feature"}
+
+``tree_mode`` may be set per job and defaults to ``--tree-mode``.
+
+A job whose files include a language with no available parser (e.g.
+TypeScript with ``--parser local`` and no lss/js server running) is
+reported with ``status: "degraded"`` and the affected languages in
+``unparsed_languages``; those files are still listed, with their
+whole-file diff but no definitions. The exit code is 1 if any job
+failed, 2 if any job was degraded, and 0 otherwise.
+
+Usage (from ``src/backend``)::
+
+    python -m cli.batch_diff jobs.ndjson --parser local --workers 8 \\
+        --cache-dir .parse-cache --format ndjson --output trees.ndjson
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional, TextIO
+
+from core.diff_parser import PARSER_MODES
+from core.diff_models import convert_nodes
+from core.diff_to_tree import diff_to_tree_nodes
+from core.parse_cache import ParseCache
+
+
+def load_jobs(stream: TextIO, default_tree_mode: str) -> list[dict]:
+    """Load jobs from a JSON array or NDJSON stream.
+
+    Raises
+    ------
+    ValueError
+        If the input is not valid JSON/NDJSON or a job is missing a field.
+    """
+    text = stream.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        raw_jobs = json.loads(stripped)
+    else:
+        raw_jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    jobs: list[dict] = []
+    for index, raw in enumerate(raw_jobs):
+        missing = [
+            key
+            for key in ("repo_path", "base_branch", "compare_branch")
+            if not isinstance(raw, dict) or key not in raw
+        ]
+        if missing:
+            raise ValueError(f"job {index} is missing {', '.join(missing)}")
+        jobs.append(
+            {
+                "repo_path": raw["repo_path"],
+                "base_branch": raw["base_branch"],
+                "compare_branch": raw["compare_branch"],
+                "tree_mode": raw.get("tree_mode", default_tree_mode),
+            }
+        )
+    return jobs
+
+
+def run_job(
+    job: dict,
+    parser_mode: str,
+    cache_dir: Optional[str],
+    skip_reformatted: bool = False,
+) -> dict:
+    """Compute the diff tree for a single job and time it.
+
+    Errors are reported in the result instead of raised, so that one bad
+    job does not abort the whole batch.
+    """
+    parse_cache = ParseCache(cache_dir) if cache_dir else None
+    unparsed_languages: set[str] = set()
+    result = dict(job)
+    started = time.perf_counter()
+    try:
+        nodes = diff_to_tree_nodes(
+            job["repo_path"],
+            job["base_branch"],
+            job["compare_branch"],
+            job["tree_mode"],
+            parser_mode,
+            parse_cache,
+            skip_reformatted,
+            unparsed_languages,
+        )
+    except Exception as exc:
+        # Any failure (bad repo, git error, parser crash) only fails this job.
+        result.update(status="error", error=f"{type(exc).__name__}: {exc}", tree=None)
+    else:
+        result.update(
+            status="degraded" if unparsed_languages else "ok",
+            error=None,
+            # Serialize straight to dicts; no pydantic models are needed
+            # for JSON output.
+            tree=convert_nodes(nodes, lambda node: node.to_dict(release=True), True),
+        )
+    result["unparsed_languages"] = sorted(unparsed_languages)
+    result["elapsed_seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _error_result(job: dict, exc: BaseException) -> dict:
+    """Build the result record for a job whose worker did not return."""
+    result = dict(job)
+    result.update(
+        status="error",
+        error=f"{type(exc).__name__}: {exc}",
+        tree=None,
+        unparsed_languages=[],
+        elapsed_seconds=0.0,
+    )
+    return result
+
+
+def _report(result: dict, out: TextIO) -> None:
+    """Write a one-line timing summary for a finished job."""
+    label = (
+        f"{result['repo_path']} {result['base_branch']}...{result['compare_branch']}"
+    )
+    if result["status"] == "error":
+        suffix = f": {result['error']}"
+    elif result["status"] == "degraded":
+        suffix = f": no parser for {', '.join(result['unparsed_languages'])}"
+    else:
+        suffix = ""
+    print(
+        f"[{result['status']}] {result['elapsed_seconds']:.3f}s {label}{suffix}",
+        file=out,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m cli.batch_diff",
+        description="Compute diff trees for many branch pairs in parallel.",
+    )
+    parser.add_argument(
+        "jobs",
+        help="JSON or NDJSON file with jobs, or '-' to read from stdin",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="output file, or '-' for stdout (default)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson"),
+        default="ndjson",
+        help="output format (default: ndjson)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSER_MODES,
+        default="local",
+        help="'local' parses in-process where possible, 'rpc' uses the "
+        "language servers (default: local)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory for the parse cache shared by all workers",
+    )
+    parser.add_argument(
+        "--tree-mode",
+        default="flat",
+        help="default tree mode for jobs that do not set one (default: flat)",
+    )
+    parser.add_argument(
+        "--skip-reformatted",
+        action="store_true",
+        help="report formatting-only changes as 'reformatted' without a diff",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        if args.jobs == "-":
+            jobs = load_jobs(sys.stdin, args.tree_mode)
+        else:
+            with open(args.jobs, encoding="utf-8") as f:
+                jobs = load_jobs(f, args.tree_mode)
+    except (OSError, ValueError) as exc:
+        parser.error(f"could not read jobs: {exc}")
+
+    if args.cache_dir:
+        # Create the directory once up front instead of racing in workers.
+        ParseCache(args.cache_dir)
+
+    out = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8")
+    )
+    results: list[Optional[dict]] = [None] * len(jobs)
+    failed = 0
+    degraded = 0
+    started = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            futures = {
+                executor.submit(
+                    run_job,
+                    job,
+                    args.parser,
+                    args.cache_dir,
+                    args.skip_reformatted,
+                ): index
+                for index, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    # The worker itself broke (e.g. a crashed process); record
+                    # it as a failed job instead of aborting the batch.
+                    result = _error_result(jobs[futures[future]], exc)
+                _report(result, sys.stderr)
+                if result["status"] == "error":
+                    failed += 1
+                elif result["status"] == "degraded":
+                    degraded += 1
+                if args.format == "ndjson":
+                    # Stream results as they finish.
+                    out.write(json.dumps(result) + "\n")
+                    out.flush()
+                else:
+                    results[futures[future]] = result
+
+        if args.format == "json":
+            json.dump(results, out, indent=2)
+            out.write("\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{len(jobs)} jobs, {failed} failed, {degraded} degraded, "
+        f"{elapsed:.3f}s total",
+        file=sys.stderr,
+    )
+    if failed:
+        return 1
+    return 2 if degraded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Compact in-memory representation of parsed definitions.
+
+``parse_code_structure`` returns a dict of dicts, each holding a full copy
+of the definition's source. Nested definitions make this worse: a class's
+source already contains all of its methods. ``DefTable`` keeps one slotted
+``DefRecord`` per definition instead, with the source stored as an
+``(offset, length)`` view into the file content it was parsed from, and
+qualified names interned.
+"""
+
+import re
+import sys
+from typing import Dict, Iterator, Optional
+
+from .local_parser import FILE_FINGERPRINT_KEY
+
+# Line breaks as counted by each column encoding's parser: Python's ``ast``
+# (UTF-8 byte columns) and Babel (UTF-16 code unit columns, which also
+# treats U+2028/U+2029 as line terminators).
+_LINE_BREAKS = {
+    "utf-8": re.compile(r"\r\n|[\r\n]"),
+    "utf-16": re.compile(r"\r\n|[\r\n\u2028\u2029]"),
+}
+
+
+def _column_to_index(line: str, column: int, column_encoding: str) -> int:
+    """Convert a parser column on ``line`` into a character index."""
+    if line.isascii():
+        return column
+    if column_encoding == "utf-8":
+        return len(line.encode("utf-8")[:column].decode("utf-8", "ignore"))
+    # UTF-16: characters outside the BMP take two code units.
+    units = 0
+    for index, char in enumerate(line):
+        if units >= column:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+class DefRecord:
+    """A single parsed definition (function, class, ...)."""
+
+    __slots__ = (
+        "qualname",
+        "kind",
+        "start_line",
+        "end_line",
+        "start_column",
+        "end_column",
+        "fingerprint",
+        "offset",
+        "length",
+        "fallback_source",
+    )
+
+    def __init__(
+        self,
+        qualname: str,
+        kind: str,
+        start_line: int,
+        end_line: int,
+        start_column: int,
+        end_column: int,
+        fingerprint: Optional[str],
+        offset: int,
+        length: int,
+        fallback_source: Optional[str] = None,
+    ) -> None:
+        self.qualname = qualname
+        self.kind = kind
+        self.start_line = start_line
+        self.end_line = end_line
+        self.start_column = start_column
+        self.end_column = end_column
+        self.fingerprint = fingerprint
+        self.offset = offset
+        self.length = length
+        # Only set when the positions could not be mapped onto the buffer.
+        self.fallback_source = fallback_source
+
+    @property
+    def position(self) -> tuple[int, int, int, int]:
+        return (self.start_line, self.end_line, self.start_column, self.end_column)
+
+
+class DefTable:
+    """Definitions of one file, keyed by qualified name."""
+
+    __slots__ = ("buffer", "records", "fingerprint")
+
+    def __init__(
+        self,
+        buffer: str,
+        records: Dict[str, DefRecord],
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        self.buffer = buffer
+        self.records = records
+        # Layout-insensitive fingerprint of the whole file, if the parser
+        # provided one.
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_structure(
+        cls,
+        structure: Dict[str, dict],
+        buffer: str,
+        column_encoding: str = "utf-8",
+    ) -> "DefTable":
+        """
+        Build a table from a ``parse_code_structure`` result.
+
+        Each definition's offset/length in ``buffer`` is computed from its
+        line/column positions, with columns counted in ``column_encoding``
+        (see ``LANGUAGE_CONFIG``), so the structure does not need to carry
+        source strings. The parser's ``source`` is only used when the
+        positions do not fit the buffer.
+        """
+        line_starts = [0]
+        line_starts.extend(
+            match.end() for match in _LINE_BREAKS[column_encoding].finditer(buffer)
+        )
+        line_starts.append(len(buffer))
+
+        def to_offset(line: int, column: int) -> Optional[int]:
+            if not 0 < line < len(line_starts):
+                return None
+            start, end = line_starts[line - 1], line_starts[line]
+            return start + _column_to_index(buffer[start:end], column, column_encoding)
+
+        records: Dict[str, DefRecord] = {}
+        fingerprint: Optional[str] = None
+        for name, info in structure.items():
+            if name == FILE_FINGERPRINT_KEY:
+                fingerprint = info.get("fingerprint")
+                continue
+            start_line = info.get("start_line", 0)
+            end_line = info.get("end_line", 0)
+            start_column = info.get("start_column", 0)
+            end_column = info.get("end_column", 0)
+            start = to_offset(start_line, start_column)
+            end = to_offset(end_line, end_column)
+            offset, length, fallback = 0, 0, None
+            if start is not None and end is not None and start <= end:
+                offset, length = start, end - start
+            elif info.get("source"):
+                fallback = info["source"]
+                length = len(fallback)
+
+            qualname = sys.intern(name)
+            records[qualname] = DefRecord(
+                qualname=qualname,
+                kind=sys.intern(info.get("type", "definition")),
+                start_line=start_line,
+                end_line=end_line,
+                start_column=start_column,
+                end_column=end_column,
+                fingerprint=info.get("fingerprint"),
+                offset=offset,
+                length=length,
+                fallback_source=fallback,
+            )
+        return cls(buffer, records, fingerprint)
+
+    def __contains__(self, qualname: str) -> bool:
+        return qualname in self.records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.records)
+
+    def __getitem__(self, qualname: str) -> DefRecord:
+        return self.records[qualname]
+
+    def get(self, qualname: str) -> Optional[DefRecord]:
+        return self.records.get(qualname)
+
+    def source(self, record: Optional[DefRecord]) -> str:
+        """Materialise the source text of a record."""
+        if record is None:
+            return ""
+        if record.fallback_source is not None:
+            return record.fallback_source
+        return self.buffer[record.offset:record.offset + record.length]
+
+    def same_source(self, other: "DefTable", qualname: str) -> bool:
+        """Return True if ``qualname`` has identical source in both tables."""
+        mine = self.records[qualname]
+        theirs = other.records[qualname]
+        # Cheap length check before slicing out either source.
+        if mine.length != theirs.length:
+            return False
+        return self.source(mine) == other.source(theirs)
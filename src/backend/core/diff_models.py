@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Callable, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -26,13 +26,104 @@ class ProjectTreeNode(BaseModel):
     source: str = ""
 
 
-def make_code_position(def_info: dict) -> CodePosition:
-    """Safely construct a CodePosition from parsed definition info."""
-    return CodePosition(
-        start_line=def_info.get("start_line", 0),
-        end_line=def_info.get("end_line", 0),
-        start_column=def_info.get("start_column", 0),
-        end_column=def_info.get("end_column", 0),
-    )
+class TreeNode:
+    """
+    Lightweight, slotted counterpart of ``ProjectTreeNode``.
 
+    The diff pipeline builds these and only converts them at the
+    serialization boundary, either to pydantic models (``to_model``) or
+    straight to plain dicts (``to_dict``).
 
+    With ``release=True`` both conversions empty each node's children list
+    as they go, dropping every child as soon as it is converted, so the
+    ``TreeNode`` tree is freed while the output is built instead of being
+    held alongside it.
+    """
+
+    __slots__ = ("id", "label", "kind", "status", "position", "path", "children", "source")
+
+    def __init__(
+        self,
+        id: str,
+        label: str,
+        kind: str,
+        status: str,
+        path: str,
+        source: str = "",
+        position: tuple[int, int, int, int] = (0, 0, 0, 0),
+        children: Optional[List["TreeNode"]] = None,
+    ) -> None:
+        self.id = id
+        self.label = label
+        self.kind = kind
+        self.status = status
+        # (start_line, end_line, start_column, end_column)
+        self.position = position
+        self.path = path
+        self.children: List["TreeNode"] = children if children is not None else []
+        self.source = source
+
+    def to_model(self, release: bool = False) -> ProjectTreeNode:
+        """Convert this node (and its children) to a ``ProjectTreeNode``."""
+        start_line, end_line, start_column, end_column = self.position
+        return ProjectTreeNode(
+            id=self.id,
+            label=self.label,
+            kind=self.kind,
+            status=self.status,
+            code_position=CodePosition(
+                start_line=start_line,
+                end_line=end_line,
+                start_column=start_column,
+                end_column=end_column,
+            ),
+            path=self.path,
+            children=convert_nodes(
+                self.children, lambda child: child.to_model(release), release
+            ),
+            source=self.source,
+        )
+
+    def to_dict(self, release: bool = False) -> dict:
+        """
+        Convert this node (and its children) to a plain dict.
+
+        The result equals ``self.to_model().model_dump()`` without building
+        the intermediate models.
+        """
+        start_line, end_line, start_column, end_column = self.position
+        return {
+            "id": self.id,
+            "label": self.label,
+            "kind": self.kind,
+            "status": self.status,
+            "code_position": {
+                "start_line": start_line,
+                "end_line": end_line,
+                "start_column": start_column,
+                "end_column": end_column,
+            },
+            "path": self.path,
+            "children": convert_nodes(
+                self.children, lambda child: child.to_dict(release), release
+            ),
+            "source": self.source,
+        }
+
+
+def convert_nodes(
+    nodes: List[TreeNode], convert: Callable[[TreeNode], Any], release: bool
+) -> list:
+    """
+    Apply ``convert`` to each node in ``nodes``.
+
+    With ``release`` the list is emptied as it goes, so each node can be
+    freed as soon as it has been converted.
+    """
+    if not release:
+        return [convert(node) for node in nodes]
+    nodes.reverse()
+    converted = []
+    while nodes:
+        converted.append(convert(nodes.pop()))
+    return converted
@@ -1,17 +1,41 @@
 import json
+import sys
 import urllib.request
-from typing import Dict
+from typing import Dict, Optional, Set
 
 from .language_config import LANGUAGE_CONFIG
+from .local_parser import LOCAL_PARSERS
 
+# Supported values for the ``mode`` argument of ``parse_code_structure``.
+PARSER_MODES = ("rpc", "local")
 
-def parse_code_structure(source_code: str, language: str) -> Dict[str, dict]:
+class ParserUnavailableError(RuntimeError):
+    """Raised when no parser could produce a structure for a language."""
+
+
+def parse_code_structure(
+    source_code: str,
+    language: str,
+    mode: str = "rpc",
+    warned_languages: Optional[Set[str]] = None,
+) -> Dict[str, dict]:
     """
     Parse Python source code into a structured representation.
 
-    First, this tries to delegate to the external JSON-RPC parser
-    (the `parse_python_code` method exposed by the lss/py service).
-    If that call fails for any reason, it falls back to local AST parsing.
+    With ``mode="rpc"`` this delegates to the external JSON-RPC parser
+    (e.g. the `parse_python_code` method exposed by the lss/py service).
+    With ``mode="local"`` languages that have an in-process parser (see
+    ``LOCAL_PARSERS``) are parsed without any server running; other
+    languages still go through JSON-RPC.
+
+    A failed JSON-RPC call is logged to stderr. Pass the same
+    ``warned_languages`` set for every blob of one diff to log each
+    unreachable language only once for that diff.
+
+    Raises
+    ------
+    ParserUnavailableError
+        If the JSON-RPC call fails or returns an unexpected payload.
 
     Each definition is keyed by a *qualified name* that encodes its
     nesting, e.g.:
@@ -20,12 +44,18 @@ def parse_code_structure(source_code: str, language: str) -> Dict[str, dict]:
     - ``Foo``                  – top‑level class
     - ``Foo.bar``             – method ``bar`` inside class ``Foo``
     - ``main.pop``            – nested function ``pop`` inside ``main``
+
+    Parsers may also return a ``<file>`` entry (see
+    ``local_parser.FILE_FINGERPRINT_KEY``) holding the whole-file
+    fingerprint; it is not a definition.
     """
     structure: Dict[str, dict] = {}
     if not source_code:
         return structure
 
-    # Try JSON-RPC parser first
+    if mode == "local" and language in LOCAL_PARSERS:
+        return LOCAL_PARSERS[language](source_code)
+
     lang_cfg = LANGUAGE_CONFIG[language]
     method = lang_cfg["method"]
     port = lang_cfg["port"]
@@ -49,9 +79,22 @@ def parse_code_structure(source_code: str, language: str) -> Dict[str, dict]:
             result = response_data["result"]
             if isinstance(result, dict):
                 return result
+        error: object = (
+            response_data.get("error")
+            if isinstance(response_data, dict)
+            else response_data
+        )
     except Exception as e:
-        print(f" Failed to parse code structure: {e} {port} {method} ")
-        # If remote parsing fails, fall back to local AST logic below.
-        pass
+        error = e
 
-    return structure
+    # Remote parsing failed or returned an unexpected payload.
+    if warned_languages is None or language not in warned_languages:
+        if warned_languages is not None:
+            warned_languages.add(language)
+        print(
+            f" Failed to parse code structure: {error} {port} {method} ",
+            file=sys.stderr,
+        )
+    raise ParserUnavailableError(
+        f"no parser available for {language!r} ({method} on port {port})"
+    )
@@ -1,13 +1,29 @@
+from typing import Optional, Set
+
 import git
 
-from .diff_models import ProjectTreeNode
+from .diff_models import ProjectTreeNode, TreeNode, convert_nodes
 from .diff_utils import build_project_tree_from_branch_diff
+from .parse_cache import ParseCache
 
 
-def diff_to_tree(
-    repo_path: str, base_branch: str, compare_branch: str, tree_mode: str
-) -> list[ProjectTreeNode]:
-    """Return a diff tree for the given repository path.
+def diff_to_tree_nodes(
+    repo_path: str,
+    base_branch: str,
+    compare_branch: str,
+    tree_mode: str,
+    parser_mode: str = "rpc",
+    parse_cache: Optional[ParseCache] = None,
+    skip_reformatted: bool = False,
+    unparsed_languages: Optional[Set[str]] = None,
+) -> list[TreeNode]:
+    """Return a diff tree for the given repository path as ``TreeNode``s.
+
+    Callers that serialize without pydantic (e.g. the batch CLI) convert
+    these with ``TreeNode.to_dict``.
+
+    Languages whose parser was unavailable are collected into
+    ``unparsed_languages`` when a set is given.
 
     Raises
     ------
@@ -16,12 +32,52 @@ def diff_to_tree(
     """
     try:
         repo = git.Repo(repo_path)
-        return build_project_tree_from_branch_diff(
+        nodes = build_project_tree_from_branch_diff(
             repo,
             base_branch,
             compare_branch,
-            tree_mode
+            tree_mode,
+            parser_mode,
+            parse_cache,
+            skip_reformatted,
+            unparsed_languages,
         )
     except (git.exc.InvalidGitRepositoryError, git.exc.NoSuchPathError) as exc:
         message = f"{repo_path!r} is not a valid git repository"
         raise ValueError(message) from exc
+
+    return nodes
+
+
+def diff_to_tree(
+    repo_path: str,
+    base_branch: str,
+    compare_branch: str,
+    tree_mode: str,
+    parser_mode: str = "rpc",
+    parse_cache: Optional[ParseCache] = None,
+    skip_reformatted: bool = False,
+    unparsed_languages: Optional[Set[str]] = None,
+) -> list[ProjectTreeNode]:
+    """Return a diff tree for the given repository path.
+
+    See ``diff_to_tree_nodes`` for the arguments.
+
+    Raises
+    ------
+    ValueError
+        If the path does not exist or is not a valid git repository.
+    """
+    nodes = diff_to_tree_nodes(
+        repo_path,
+        base_branch,
+        compare_branch,
+        tree_mode,
+        parser_mode,
+        parse_cache,
+        skip_reformatted,
+        unparsed_languages,
+    )
+    # Serialization boundary: only now build the pydantic models, freeing
+    # the TreeNodes as they are converted.
+    return convert_nodes(nodes, lambda node: node.to_model(release=True), True)
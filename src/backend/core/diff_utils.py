@@ -1,11 +1,13 @@
 import difflib
-from typing import List
+from typing import List, Optional, Set
 
 import git
 
-from .diff_models import CodePosition, ProjectTreeNode, make_code_position
-from .diff_parser import parse_code_structure
+from .def_table import DefRecord, DefTable
+from .diff_models import TreeNode
+from .diff_parser import ParserUnavailableError, parse_code_structure
 from .language_config import LANGUAGE_CONFIG
+from .parse_cache import ParseCache
 
 
 # Build a lookup from file-extension -> language key (e.g. ".py" -> "python").
@@ -58,12 +60,88 @@ def build_file_diff_source(
     return "\n".join(diff_lines)
 
 
+def is_reformatted(base_record: DefRecord, compare_record: DefRecord) -> bool:
+    """
+    Return True if a definition only changed in formatting.
+
+    Parsers attach a whitespace- and comment-insensitive ``fingerprint``
+    to each definition; equal fingerprints mean the token streams match.
+    Definitions without a fingerprint are never considered reformatted.
+    """
+    return bool(base_record.fingerprint) and (
+        base_record.fingerprint == compare_record.fingerprint
+    )
+
+
+def parse_blob_structure(
+    blob: Optional[git.Blob],
+    content: str,
+    language: str,
+    parser_mode: str = "rpc",
+    parse_cache: Optional[ParseCache] = None,
+    warned_languages: Optional[Set[str]] = None,
+) -> dict[str, dict]:
+    """Parse a blob's content, consulting the parse cache when given.
+
+    ``warned_languages`` is passed through to ``parse_code_structure``.
+
+    Raises
+    ------
+    ParserUnavailableError
+        If the language's parser could not be reached.
+    """
+    if blob is None or parse_cache is None:
+        return parse_code_structure(
+            content, language, parser_mode, warned_languages
+        )
+
+    cached = parse_cache.get(parser_mode, language, blob.hexsha)
+    if cached is not None:
+        return cached
+
+    structure = parse_code_structure(
+        content, language, parser_mode, warned_languages
+    )
+    # DefTable locates definitions by position, so the per-definition
+    # source copies are not worth storing.
+    structure = {
+        name: {key: value for key, value in info.items() if key != "source"}
+        for name, info in structure.items()
+    }
+    parse_cache.set(parser_mode, language, blob.hexsha, structure)
+    return structure
+
+
 def build_project_tree_from_branch_diff(
-    repo: git.Repo, base_branch: str, compare_branch: str, tree_mode: str
-) -> list[ProjectTreeNode]:
+    repo: git.Repo,
+    base_branch: str,
+    compare_branch: str,
+    tree_mode: str,
+    parser_mode: str = "rpc",
+    parse_cache: Optional[ParseCache] = None,
+    skip_reformatted: bool = False,
+    unparsed_languages: Optional[Set[str]] = None,
+) -> list[TreeNode]:
     """
     Build a tree of changed files/definitions between two branches.
 
+    Returns lightweight ``TreeNode`` objects; callers convert them with
+    ``TreeNode.to_model`` when serializing.
+
+    ``parser_mode`` is passed through to ``parse_code_structure`` and
+    ``parse_cache``, when given, is used to avoid re-parsing blobs that
+    have already been seen.
+
+    With ``skip_reformatted`` definitions whose source changed but whose
+    token fingerprint did not are reported as ``reformatted`` without a
+    diff, so formatter sweeps don't drown out real changes. A file is
+    only reported as ``reformatted`` (and its whole-file diff dropped)
+    when its whole-file fingerprint matches too.
+
+    Files whose language parser is unavailable are kept as plain file
+    nodes (with the whole-file diff but no definitions); their language
+    is added to ``unparsed_languages`` when a set is given.
+
     We only want to register the *changes made on the compare branch*,
     not changes that might have happened on the base branch after the
     branches diverged. To achieve this we diff from the merge base
@@ -91,7 +169,9 @@ def build_project_tree_from_branch_diff(
 
     # First collect a flat list of file‑level nodes; we'll wrap these in a
     # folder hierarchy once we've processed the whole diff.
-    file_nodes: List[ProjectTreeNode] = []
+    file_nodes: List[TreeNode] = []
+    # Languages whose parser outage was already logged for this diff.
+    warned_languages: Set[str] = set()
 
     for diff_item in diff_index:
         # resolve the path (handles renames)
@@ -125,29 +205,6 @@ def build_project_tree_from_branch_diff(
             else ""
         )
 
-        # Build a clean, parseable unified diff for the whole file.
-        file_diff_source = build_file_diff_source(
-            path,
-            content_base,
-            content_compare,
-        )
-
-        struct_base = parse_code_structure(content_base, language)
-        struct_compare = parse_code_structure(content_compare, language)
-
-        base_keys = set(struct_base.keys())
-        compare_keys = set(struct_compare.keys())
-
-        added = compare_keys - base_keys
-        removed = base_keys - compare_keys
-        common = base_keys & compare_keys
-
-        modified = [
-            name
-            for name in common
-            if struct_base[name]["source"] != struct_compare[name]["source"]
-        ]
-
         # Map git change types to a simple status for the file node.
         # On some GitPython versions, change_type may be None when
         # create_patch=True, so we derive it from blobs as a fallback.
@@ -162,30 +219,122 @@ def build_project_tree_from_branch_diff(
             else:
                 change_type = "M"
 
+        column_encoding = LANGUAGE_CONFIG[language]["column_encoding"]
+        try:
+            # Keep definitions as compact tables; the parser's dicts (with
+            # their per-definition source copies) are dropped right away.
+            table_base = DefTable.from_structure(
+                parse_blob_structure(
+                    diff_item.a_blob,
+                    content_base,
+                    language,
+                    parser_mode,
+                    parse_cache,
+                    warned_languages,
+                ),
+                content_base,
+                column_encoding,
+            )
+            table_compare = DefTable.from_structure(
+                parse_blob_structure(
+                    diff_item.b_blob,
+                    content_compare,
+                    language,
+                    parser_mode,
+                    parse_cache,
+                    warned_languages,
+                ),
+                content_compare,
+                column_encoding,
+            )
+        except ParserUnavailableError:
+            # Without a parser we can't tell which definitions changed, but
+            # dropping the file would hide the change entirely. Keep it as a
+            # plain file node with its whole-file diff.
+            if unparsed_languages is not None:
+                unparsed_languages.add(language)
+            file_nodes.append(
+                TreeNode(
+                    id=path,
+                    label=path,
+                    kind="file",
+                    status={"A": "added", "D": "removed"}.get(
+                        change_type, "modified"
+                    ),
+                    path=path,
+                    source=build_file_diff_source(
+                        path,
+                        content_base,
+                        content_compare,
+                    ),
+                )
+            )
+            continue
+
+        base_keys = set(table_base)
+        compare_keys = set(table_compare)
+
+        added = compare_keys - base_keys
+        removed = base_keys - compare_keys
+        common = base_keys & compare_keys
+
+        modified = [
+            name
+            for name in common
+            if not table_base.same_source(table_compare, name)
+        ]
+
+        reformatted: list[str] = []
+        if skip_reformatted:
+            reformatted = [
+                name
+                for name in modified
+                if is_reformatted(table_base[name], table_compare[name])
+            ]
+            if reformatted:
+                reformatted_set = set(reformatted)
+                modified = [
+                    name for name in modified if name not in reformatted_set
+                ]
+
         # For modified files with no semantic changes, skip.
         # For added/deleted files, always keep them (even if empty).
         if change_type not in ("A", "D") and not any(
-            [added, removed, modified]
+            [added, removed, modified, reformatted]
         ):
             continue
         if change_type == "A":
             file_status = "added"
         elif change_type == "D":
             file_status = "removed"
+        elif (
+            not any([added, removed, modified])
+            and table_base.fingerprint is not None
+            and table_base.fingerprint == table_compare.fingerprint
+        ):
+            # Only when the whole file's tokens match too; otherwise code
+            # outside any definition (imports, module constants) changed.
+            file_status = "reformatted"
         else:
             file_status = "modified"
 
-        file_node = ProjectTreeNode(
+        # Build a clean, parseable unified diff for the whole file.
+        # Files that were only reformatted don't get one.
+        file_diff_source = (
+            ""
+            if file_status == "reformatted"
+            else build_file_diff_source(
+                path,
+                content_base,
+                content_compare,
+            )
+        )
+
+        file_node = TreeNode(
             id=path,
             label=path,
             kind="file",
             status=file_status,
-            code_position=CodePosition(
-                start_line=0,
-                end_line=0,
-                start_column=0,
-                end_column=0,
-            ),
             path=path,
             source=file_diff_source,
         )
@@ -193,75 +342,81 @@ def build_project_tree_from_branch_diff(
         # Build child nodes for each changed definition.
         # First create a flat map keyed by qualified name,
         # then assemble a hierarchy (e.g. "main.pop" under "main").
-        def_nodes: dict[str, ProjectTreeNode] = {}
+        def_nodes: dict[str, TreeNode] = {}
 
         # Added definitions
         for name in sorted(added):
-            info = struct_compare.get(name, {})
-            def_type = info.get("type", "definition")
+            record = table_compare[name]
             diff_source = build_def_diff_source(
                 path,
                 name,
                 "",
-                info.get("source", ""),
+                table_compare.source(record),
             )
-            def_nodes[name] = ProjectTreeNode(
+            def_nodes[name] = TreeNode(
                 id=f"{path}:{name}",
                 label=name.split(".")[-1],
-                kind=def_type,
+                kind=record.kind,
                 status="added",
-                code_position=make_code_position(info),
+                position=record.position,
                 path=path,
                 source=diff_source,
             )
 
         # Removed definitions
         for name in sorted(removed):
-            info = struct_base.get(name, {})
-            def_type = info.get("type", "definition")
+            record = table_base[name]
             diff_source = build_def_diff_source(
                 path,
                 name,
-                info.get("source", ""),
+                table_base.source(record),
                 "",
             )
-            def_nodes[name] = ProjectTreeNode(
+            def_nodes[name] = TreeNode(
                 id=f"{path}:{name}",
                 label=name.split(".")[-1],
-                kind=def_type,
+                kind=record.kind,
                 status="removed",
-                code_position=make_code_position(info),
+                position=record.position,
                 path=path,
                 source=diff_source,
             )
 
         # Modified definitions
         for name in sorted(modified):
-            base_info = struct_base.get(name, {})
-            compare_info = struct_compare.get(name, {})
-            def_type = compare_info.get(
-                "type", base_info.get("type", "definition")
-            )
+            base_record = table_base[name]
+            compare_record = table_compare[name]
             diff_source = build_def_diff_source(
                 path,
                 name,
-                base_info.get("source", ""),
-                compare_info.get("source", ""),
+                table_base.source(base_record),
+                table_compare.source(compare_record),
             )
-            # Use the "new" position where possible
-            position_source = compare_info or base_info
-            def_nodes[name] = ProjectTreeNode(
+            # Use the "new" kind and position
+            def_nodes[name] = TreeNode(
                 id=f"{path}:{name}",
                 label=name.split(".")[-1],
-                kind=def_type,
+                kind=compare_record.kind,
                 status="modified",
-                code_position=make_code_position(position_source),
+                position=compare_record.position,
                 path=path,
                 source=diff_source,
             )
 
+        # Reformatted definitions: listed, but without a diff
+        for name in sorted(reformatted):
+            compare_record = table_compare[name]
+            def_nodes[name] = TreeNode(
+                id=f"{path}:{name}",
+                label=name.split(".")[-1],
+                kind=compare_record.kind,
+                status="reformatted",
+                position=compare_record.position,
+                path=path,
+            )
+
         # Attach nodes to the correct parents based on qualified name.
-        children: List[ProjectTreeNode] = []
+        children: List[TreeNode] = []
         for qualname, node in def_nodes.items():
             parent_qual, sep, _ = qualname.rpartition(".")
             if parent_qual and parent_qual in def_nodes:
@@ -279,14 +434,14 @@ def build_project_tree_from_branch_diff(
     # For a path like "src/backend/core/diff_utils.py" we create folder
     # nodes "src", "src/backend", "src/backend/core" and attach the file
     # node as a child of the deepest folder.
-    root_nodes: List[ProjectTreeNode] = []
-    dir_nodes: dict[str, ProjectTreeNode] = {}
+    root_nodes: List[TreeNode] = []
+    dir_nodes: dict[str, TreeNode] = {}
 
     for file_node in file_nodes:
         parts = file_node.path.split("/")
 
         # Files at the repository root go directly under root_nodes.
-        parent_children: List[ProjectTreeNode] = root_nodes
+        parent_children: List[TreeNode] = root_nodes
         parent_path = ""
 
         # Create/lookup folder nodes for all but the last path part
@@ -295,20 +450,13 @@ def build_project_tree_from_branch_diff(
             dir_path = part if not parent_path else f"{parent_path}/{part}"
             folder_node = dir_nodes.get(dir_path)
             if folder_node is None:
-                folder_node = ProjectTreeNode(
+                folder_node = TreeNode(
                     id=dir_path,
                     label=part,
                     kind="folder",
                     # Any folder that appears in the diff contains changes.
                     status="modified",
-                    code_position=CodePosition(
-                        start_line=0,
-                        end_line=0,
-                        start_column=0,
-                        end_column=0,
-                    ),
                     path=dir_path,
-                    source="",
                 )
                 dir_nodes[dir_path] = folder_node
                 parent_children.append(folder_node)
@@ -320,7 +468,7 @@ def build_project_tree_from_branch_diff(
         parent_children.append(file_node)
 
     # Sort folders/files alphabetically, with folders first at each level.
-    def _sort_children(nodes: List[ProjectTreeNode]) -> None:
+    def _sort_children(nodes: List[TreeNode]) -> None:
         nodes.sort(key=lambda n: (n.kind != "folder", n.label.lower()))
         for node in nodes:
             if node.children:
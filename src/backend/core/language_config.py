@@ -7,6 +7,8 @@ different languages. Each entry describes:
 - ``method``: JSON‑RPC method name
 - ``port``: TCP port the service listens on
 - ``extensions``: list of file extensions handled by this language
+- ``column_encoding``: unit the parser counts columns in (``"utf-8"``
+  bytes for Python's ``ast``, ``"utf-16"`` code units for Babel)
 """
 
 from typing import Dict, List, TypedDict
@@ -16,6 +18,7 @@ class LanguageConfigEntry(TypedDict):
     method: str
     port: int
     extensions: List[str]
+    column_encoding: str
 
 
 LANGUAGE_CONFIG: Dict[str, LanguageConfigEntry] = {
@@ -24,18 +27,21 @@ LANGUAGE_CONFIG: Dict[str, LanguageConfigEntry] = {
         "method": "parse_python_code",
         "port": 5000,
         "extensions": [".py"],
+        "column_encoding": "utf-8",
     },
     # TypeScript code – parsed by the lss/js JSON‑RPC server in src/lss/js/index.ts
     "typescript": {
         "method": "parse_typescript_code",
         "port": 5001,
         "extensions": [".ts", ".tsx"],
+        "column_encoding": "utf-16",
     },
     # JavaScript code – parsed by the lss/js JSON‑RPC server in src/lss/js/index.ts
     "javascript": {
         "method": "parse_javascript_code",
         "port": 5001,
         "extensions": [".js", ".jsx"],
+        "column_encoding": "utf-16",
     },
 }
 
@@ -0,0 +1,64 @@
+"""
+On-disk cache of parsed code structures.
+
+Parse results are keyed by format version, parser mode, language and git
+blob SHA, so a blob that shows up in many diffs (the same file across many
+branch pairs) is parsed once.
+The cache is a plain directory of JSON files, which makes it safe to share
+between worker processes: writes go through a temporary file and an atomic
+rename, so readers never see a partially written entry.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+# Version of the structure format stored in the cache. Bump this whenever
+# the parsers' output changes (new fields, different fingerprints, ...) so
+# that existing cache directories stop serving stale entries.
+FORMAT_VERSION = 4
+
+
+class ParseCache:
+    """Directory-backed cache of ``parse_code_structure`` results."""
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, parser_mode: str, language: str, blob_sha: str) -> str:
+        return os.path.join(
+            self.cache_dir,
+            f"v{FORMAT_VERSION}-{parser_mode}-{language}-{blob_sha}.json",
+        )
+
+    def get(
+        self, parser_mode: str, language: str, blob_sha: str
+    ) -> Optional[Dict[str, dict]]:
+        """Return the cached structure for a blob, or ``None`` on a miss."""
+        try:
+            with open(
+                self._entry_path(parser_mode, language, blob_sha), encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(
+        self,
+        parser_mode: str,
+        language: str,
+        blob_sha: str,
+        structure: Dict[str, dict],
+    ) -> None:
+        """Store the structure for a blob."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(structure, f)
+            os.replace(tmp_path, self._entry_path(parser_mode, language, blob_sha))
+        except OSError:
+            # A failed cache write should never fail the diff itself.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,127 @@
+import io
+import json
+
+import git
+import pytest
+
+from cli.batch_diff import load_jobs, main, run_job
+from core.parse_cache import FORMAT_VERSION, ParseCache
+
+# Deep enough to make ast.parse raise RecursionError.
+DEEP_SOURCE = "X = " + "+".join(["1"] * 3000) + "\n"
+
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """Create a repo where ``compare`` changes ``mod.py`` from ``main``."""
+
+    def _make_repo(name: str, base: str, compare: str) -> str:
+        path = tmp_path / name
+        repo = git.Repo.init(path, initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        (path / "mod.py").write_text(base)
+        repo.index.add(["mod.py"])
+        repo.index.commit("base")
+        repo.git.checkout("-b", "compare")
+        (path / "mod.py").write_text(compare)
+        repo.index.add(["mod.py"])
+        repo.index.commit("compare")
+        return str(path)
+
+    return _make_repo
+
+
+def job(repo_path: str) -> dict:
+    return {
+        "repo_path": repo_path,
+        "base_branch": "main",
+        "compare_branch": "compare",
+        "tree_mode": "flat",
+    }
+
+
+def test_load_jobs_reads_json_array_and_ndjson():
+    raw = [
+        {"repo_path": "/a", "base_branch": "main", "compare_branch": "x"},
+        {"repo_path": "/b", "base_branch": "main", "compare_branch": "y",
+         "tree_mode": "tree"},
+    ]
+    from_array = load_jobs(io.StringIO(json.dumps(raw)), "flat")
+    from_ndjson = load_jobs(
+        io.StringIO("\n".join(json.dumps(r) for r in raw) + "\n\n"), "flat"
+    )
+
+    assert from_array == from_ndjson
+    assert [j["tree_mode"] for j in from_array] == ["flat", "tree"]
+
+
+def test_load_jobs_rejects_missing_fields():
+    with pytest.raises(ValueError, match="job 0 is missing compare_branch"):
+        load_jobs(io.StringIO('{"repo_path": "/a", "base_branch": "main"}'), "flat")
+
+
+def test_run_job_returns_tree(make_repo):
+    repo_path = make_repo("ok", "def f():\n    return 1\n", "def f():\n    return 2\n")
+
+    result = run_job(job(repo_path), "local", None)
+
+    assert result["status"] == "ok"
+    assert result["error"] is None
+    (file_node,) = result["tree"]
+    assert file_node["status"] == "modified"
+    assert [child["label"] for child in file_node["children"]] == ["f"]
+
+
+def test_run_job_reports_bad_repo_as_error(tmp_path):
+    result = run_job(job(str(tmp_path / "missing")), "local", None)
+
+    assert result["status"] == "error"
+    assert result["tree"] is None
+
+
+def test_run_job_survives_unparseable_source(make_repo):
+    repo_path = make_repo("deep", "X = 1\n", DEEP_SOURCE)
+
+    result = run_job(job(repo_path), "local", None)
+
+    assert result["status"] == "ok"
+    # No definitions on either side, so nothing to list.
+    assert result["tree"] == []
+
+
+def test_main_keeps_good_results_when_a_job_fails(make_repo, tmp_path):
+    good = make_repo("good", "def f():\n    return 1\n", "def f():\n    return 2\n")
+    deep = make_repo("deep", "X = 1\n", DEEP_SOURCE)
+    jobs_path = tmp_path / "jobs.ndjson"
+    jobs_path.write_text(
+        "\n".join(
+            json.dumps(j)
+            for j in (job(good), job(str(tmp_path / "missing")), job(deep))
+        )
+    )
+    output = tmp_path / "out.json"
+
+    code = main(
+        [str(jobs_path), "--format", "json", "-o", str(output), "--workers", "2"]
+    )
+
+    results = json.loads(output.read_text())
+    assert code == 1
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[0]["tree"][0]["children"][0]["label"] == "f"
+
+
+def test_parse_cache_roundtrip(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    structure = {"f": {"type": "function", "start_line": 1}}
+
+    assert cache.get("local", "python", "abc") is None
+    cache.set("local", "python", "abc", structure)
+
+    assert cache.get("local", "python", "abc") == structure
+    # Entries are keyed by parser mode and format version.
+    assert cache.get("rpc", "python", "abc") is None
+    assert (tmp_path / f"v{FORMAT_VERSION}-local-python-abc.json").exists()
+    assert not list(tmp_path.glob("*.tmp"))
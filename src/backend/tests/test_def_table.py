@@ -0,0 +1,89 @@
+from core.def_table import DefTable
+from core.local_parser import FILE_FINGERPRINT_KEY, parse_python_code
+
+
+def table_for(code: str) -> DefTable:
+    """Build a table the way a cache hit does, without source strings."""
+    structure = {
+        name: {key: value for key, value in info.items() if key != "source"}
+        for name, info in parse_python_code(code).items()
+    }
+    return DefTable.from_structure(structure, code)
+
+
+def test_sources_match_parser_without_source_strings():
+    code = (
+        'S = "é"\n'
+        "class C:\n"
+        '    def m(self): return "😀"  # ü\n'
+        "\n"
+        "    def n(self):\n"
+        '        return "ß"\n'
+    )
+    structure = parse_python_code(code)
+
+    table = table_for(code)
+
+    for name in ("C", "C.m", "C.n"):
+        assert table.source(table[name]) == structure[name]["source"]
+        assert table[name].fallback_source is None
+
+
+def test_crlf_line_endings():
+    code = 'def f():\r\n    return "é"\r\n\r\ndef g():\r\n    pass\r\n'
+
+    table = table_for(code)
+
+    assert table.source(table["f"]) == 'def f():\r\n    return "é"'
+    assert table.source(table["g"]) == "def g():\r\n    pass"
+
+
+def test_utf16_columns():
+    # Babel counts columns in UTF-16 code units; "😀" takes two.
+    code = 'const s = "😀"; function f() { return "é"; }\n'
+    structure = {
+        "f": {
+            "type": "function",
+            "start_line": 1,
+            "end_line": 1,
+            "start_column": 16,
+            "end_column": 44,
+        }
+    }
+
+    table = DefTable.from_structure(structure, code, "utf-16")
+
+    assert table.source(table["f"]) == 'function f() { return "é"; }'
+
+
+def test_invalid_positions_fall_back_to_parser_source():
+    structure = {
+        "f": {"type": "function", "source": "def f(): pass", "start_line": 0},
+        "g": {"type": "function", "start_line": 9, "end_line": 9},
+    }
+
+    table = DefTable.from_structure(structure, "def f(): pass\n")
+
+    assert table.source(table["f"]) == "def f(): pass"
+    assert table["f"].fallback_source == "def f(): pass"
+    assert table.source(table["g"]) == ""
+
+
+def test_same_source():
+    base = table_for("def f():\n    return 1\n\ndef g():\n    return 1\n")
+    compare = table_for("# moved\n\ndef f():\n    return 1\n\ndef g():\n    return 2\n")
+
+    assert base.same_source(compare, "f")
+    assert not base.same_source(compare, "g")
+
+
+def test_file_fingerprint_is_not_a_definition():
+    code = "def f():\n    pass\n"
+
+    table = table_for(code)
+
+    assert list(table) == ["f"]
+    assert FILE_FINGERPRINT_KEY not in table
+    assert table.fingerprint == parse_python_code(code)[FILE_FINGERPRINT_KEY][
+        "fingerprint"
+    ]
@@ -0,0 +1,117 @@
+import urllib.request
+
+import git
+import pytest
+
+from core.diff_utils import build_project_tree_from_branch_diff
+
+BASE_SOURCE = "X = 1\n\n\ndef f(a, b):\n    return a + b\n"
+REFORMATTED_SOURCE = "X = 1\n\n\ndef f(\n    a,\n    b,\n):\n    return a+b  # sum\n"
+
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """Create a repo with ``mod.py`` on ``main`` and a changed ``compare``."""
+
+    def _make_repo(base: str, compare: str) -> git.Repo:
+        repo = git.Repo.init(tmp_path, initial_branch="main")
+        with repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        path = tmp_path / "mod.py"
+        path.write_text(base)
+        repo.index.add(["mod.py"])
+        repo.index.commit("base")
+        repo.git.checkout("-b", "compare")
+        path.write_text(compare)
+        repo.index.add(["mod.py"])
+        repo.index.commit("compare")
+        return repo
+
+    return _make_repo
+
+
+def build(repo: git.Repo, skip_reformatted: bool):
+    return build_project_tree_from_branch_diff(
+        repo,
+        "main",
+        "compare",
+        "flat",
+        parser_mode="local",
+        skip_reformatted=skip_reformatted,
+    )
+
+
+def test_formatting_only_file_is_reformatted_without_diff(make_repo):
+    repo = make_repo(BASE_SOURCE, REFORMATTED_SOURCE)
+
+    (file_node,) = build(repo, skip_reformatted=True)
+
+    assert file_node.status == "reformatted"
+    assert file_node.source == ""
+    assert [(n.label, n.status, n.source) for n in file_node.children] == [
+        ("f", "reformatted", "")
+    ]
+
+
+def test_change_outside_definitions_keeps_file_modified(make_repo):
+    repo = make_repo(BASE_SOURCE, REFORMATTED_SOURCE.replace("X = 1", "X = 2"))
+
+    (file_node,) = build(repo, skip_reformatted=True)
+
+    assert file_node.status == "modified"
+    assert "+X = 2" in file_node.source
+    assert [(n.label, n.status) for n in file_node.children] == [
+        ("f", "reformatted")
+    ]
+
+
+def test_without_option_reformatted_definitions_are_modified(make_repo):
+    repo = make_repo(BASE_SOURCE, REFORMATTED_SOURCE)
+
+    (file_node,) = build(repo, skip_reformatted=False)
+
+    assert file_node.status == "modified"
+    assert [(n.label, n.status) for n in file_node.children] == [
+        ("f", "modified")
+    ]
+
+
+def test_parser_outage_is_logged_once_per_diff(tmp_path, monkeypatch, capsys):
+    def unreachable(*args, **kwargs):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(urllib.request, "urlopen", unreachable)
+    repo = git.Repo.init(tmp_path, initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "test")
+        config.set_value("user", "email", "test@example.com")
+    repo.index.commit("base")
+    repo.git.checkout("-b", "compare")
+    for name in ("a.ts", "b.ts"):
+        (tmp_path / name).write_text("export const x = 1;\n")
+    repo.index.add(["a.ts", "b.ts"])
+    repo.index.commit("compare")
+
+    for _ in range(2):
+        unparsed: set[str] = set()
+        nodes = build_project_tree_from_branch_diff(
+            repo, "main", "compare", "flat", unparsed_languages=unparsed
+        )
+        assert unparsed == {"typescript"}
+        assert [n.label for n in nodes] == ["a.ts", "b.ts"]
+
+    # Once per diff: a long-running server keeps reporting the outage.
+    assert capsys.readouterr().err.count("Failed to parse") == 2
+
+
+def test_to_dict_matches_model_dump(make_repo):
+    repo = make_repo(BASE_SOURCE, BASE_SOURCE + "\n\nclass C:\n    def m(self):\n        pass\n")
+    nodes = build_project_tree_from_branch_diff(
+        repo, "main", "compare", "tree", parser_mode="local"
+    )
+    expected = [node.to_model().model_dump() for node in nodes]
+
+    assert [node.to_dict(release=True) for node in nodes] == expected
+    # Released nodes no longer hold on to their children.
+    assert all(not node.children for node in nodes)
@@ -0,0 +1,83 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from core.local_parser import parse_python_code
+
+LSS_PARSER_PATH = Path(__file__).resolve().parents[2] / "lss" / "py" / "code_parser.py"
+
+
+def fingerprint(code: str, name: str = "f") -> str:
+    return parse_python_code(code)[name]["fingerprint"]
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        # Layout and comments
+        (
+            "def f(a, b):\n    return g(a, b)\n",
+            "def f(\n    a, b\n):\n    # call g\n    return g(a,\n             b)\n",
+        ),
+        # Indentation width
+        (
+            "def f():\n  if x:\n    return 1\n",
+            "def f():\n    if x:\n        return 1\n",
+        ),
+        # Quote style
+        ("def f():\n    return 'x'\n", 'def f():\n    return "x"\n'),
+        # Trailing commas that can't change meaning
+        ("def f(a, b,):\n    pass\n", "def f(a, b):\n    pass\n"),
+        ("def f():\n    g(a,)\n", "def f():\n    g(a)\n"),
+        ("def f():\n    return [a,]\n", "def f():\n    return [a]\n"),
+        ("def f():\n    return {a: 1,}\n", "def f():\n    return {a: 1}\n"),
+        ("def f():\n    return x[a, b,]\n", "def f():\n    return x[a, b]\n"),
+        ("def f():\n    return (a, b,)\n", "def f():\n    return (a, b)\n"),
+    ],
+)
+def test_formatting_only_changes_share_a_fingerprint(old, new):
+    assert fingerprint(old) == fingerprint(new)
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        # One-element tuple vs. parenthesised scalar
+        ("def f():\n    g((a,))\n", "def f():\n    g((a))\n"),
+        ("def f():\n    return (a,)\n", "def f():\n    return (a)\n"),
+        ("def f():\n    x = (\n        a,\n    )\n", "def f():\n    x = a\n"),
+        # Subscript with a one-element tuple vs. a plain index
+        ("def f():\n    return x[a,]\n", "def f():\n    return x[a]\n"),
+        # ... also when the subscripted name is a soft keyword
+        ("def f():\n    return match[a,]\n", "def f():\n    return match[a]\n"),
+        ("def f():\n    return _[a,]\n", "def f():\n    return _[a]\n"),
+        # f-string replacement field formatting a tuple
+        ('def f():\n    return f"{a,}"\n', 'def f():\n    return f"{a}"\n'),
+        # Block structure
+        (
+            "def f():\n    if x:\n        a()\n    b()\n",
+            "def f():\n    if x:\n        a()\n        b()\n",
+        ),
+        # Plain code changes
+        ("def f():\n    return 1\n", "def f():\n    return 2\n"),
+    ],
+)
+def test_real_changes_change_the_fingerprint(old, new):
+    assert fingerprint(old) != fingerprint(new)
+
+
+def test_matches_lss_parser():
+    """The backend copy must produce the same output as lss/py."""
+    spec = importlib.util.spec_from_file_location("lss_code_parser", LSS_PARSER_PATH)
+    lss_parser = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(lss_parser)
+
+    sources = [
+        Path(__file__).read_text(encoding="utf-8"),
+        LSS_PARSER_PATH.read_text(encoding="utf-8"),
+        "class K:\n    def m(self, a,):\n        return f'{a!r:>{w}}', (a,), x[a,]\n",
+        "def broken(:\n",
+    ]
+    for source in sources:
+        assert parse_python_code(source) == lss_parser.parse_code(source)
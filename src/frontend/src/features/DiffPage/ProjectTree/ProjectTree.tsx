@@ -6,7 +6,7 @@ import { cn } from "@/lib/utils";
 import ProjectTreeItem from "./ProjectTreeItem";
 import type { ProjectTreeNode } from "./types";
 import { Toggle } from "@/components/ui/toggle";
-import { FolderTree } from "lucide-react";
+import { AlignLeft, FolderTree } from "lucide-react";
 import { Input } from "@/components/ui/input";
 import ProjectTreeFilterPopover from "./ProjectTreeFilterPopover";
 import { filter as rFilter } from "remeda";
@@ -41,6 +41,15 @@ interface ProjectTreeProps {
    * Current view mode for the tree.
    */
   viewMode?: "flat" | "tree";
+  /**
+   * Whether formatting-only changes are collapsed into "reformatted" nodes.
+   * The toggle is only shown when `onSkipReformattedChange` is provided.
+   */
+  skipReformatted?: boolean;
+  /**
+   * Called when the "hide formatting-only diffs" toggle changes.
+   */
+  onSkipReformattedChange?: (skip: boolean) => void;
 }
 
 interface FilterState {
@@ -80,6 +89,8 @@ const ProjectTree: FC<ProjectTreeProps> = ({
   isLoading,
   emptyMessage,
   viewMode: controlledViewMode,
+  skipReformatted = false,
+  onSkipReformattedChange,
 }) => {
   const treeData = useMemo(
     () => (nodes && nodes.length > 0 ? nodes : []),
@@ -298,6 +309,19 @@ const ProjectTree: FC<ProjectTreeProps> = ({
         >
           <FolderTree />
         </Toggle>
+
+        {onSkipReformattedChange && (
+          <Toggle
+            size="sm"
+            pressed={skipReformatted}
+            onPressedChange={onSkipReformattedChange}
+            aria-label="Hide formatting-only diffs"
+            title="Hide formatting-only diffs"
+            className="data-[state=on]:bg-black data-[state=on]:*:[svg]:stroke-white"
+          >
+            <AlignLeft />
+          </Toggle>
+        )}
       </div>
 
       <ScrollArea className="flex-1 min-h-0">
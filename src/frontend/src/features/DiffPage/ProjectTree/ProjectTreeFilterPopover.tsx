@@ -8,7 +8,14 @@ import {
 import { Button } from "@/components/ui/button";
 import { Separator } from "@/components/ui/separator";
 import { Toggle } from "@/components/ui/toggle";
-import { Filter, FileCode2, Plus, Minus, CircleDashed } from "lucide-react";
+import {
+  Filter,
+  FileCode2,
+  Plus,
+  Minus,
+  CircleDashed,
+  AlignLeft,
+} from "lucide-react";
 import type { ChangeStatus } from "./types";
 
 interface FilterState {
@@ -36,6 +43,8 @@ const getModificationTypeIcon = (type: ChangeStatus) => {
       return <Minus className="h-3 w-3" />;
     case "modified":
       return <CircleDashed className="h-3 w-3" />;
+    case "reformatted":
+      return <AlignLeft className="h-3 w-3" />;
     case "unchanged":
       return null;
   }
@@ -49,6 +58,8 @@ const getModificationTypeLabel = (type: ChangeStatus) => {
       return "Removed";
     case "modified":
       return "Modified";
+    case "reformatted":
+      return "Reformatted";
     case "unchanged":
       return "Unchanged";
   }
@@ -71,7 +82,8 @@ const ProjectTreeFilterPopover: FC<ProjectTreeFilterPopoverProps> = ({
       added: 0,
       removed: 1,
       modified: 2,
-      unchanged: 3,
+      reformatted: 3,
+      unchanged: 4,
     };
     return Array.from(modificationTypes.entries()).sort(
       (a, b) => order[a[0] as ChangeStatus] - order[b[0] as ChangeStatus]
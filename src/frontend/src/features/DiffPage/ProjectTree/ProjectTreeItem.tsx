@@ -58,6 +58,7 @@ const statusToVariant: Record<
   added: "default",
   removed: "destructive",
   modified: "secondary",
+  reformatted: "outline",
   unchanged: "outline",
 };
 
@@ -65,6 +66,7 @@ const statusToLabel: Record<NonNullable<ProjectTreeNode["status"]>, string> = {
   added: "Added",
   removed: "Removed",
   modified: "Modified",
+  reformatted: "Reformatted",
   unchanged: "Unchanged",
 };
 
@@ -1,4 +1,9 @@
-export type ChangeStatus = "added" | "removed" | "modified" | "unchanged";
+export type ChangeStatus =
+    | "added"
+    | "removed"
+    | "modified"
+    | "reformatted"
+    | "unchanged";
 
 export type NodeKind =
     | "file"
@@ -37,6 +37,7 @@ const DiffPage: FC<DiffPageProps> = ({ repoPath, onBack, branches }) => {
   const [isLoadingDiff, setIsLoadingDiff] = useState(false);
   const [diffError, setDiffError] = useState<string | null>(null);
   const [treeMode, setTreeMode] = useState<"flat" | "tree">("flat");
+  const [skipReformatted, setSkipReformatted] = useState(false);
 
   useEffect(() => {
     if (!repoPath || !baseBranch || !compareBranch) return;
@@ -47,7 +48,13 @@ const DiffPage: FC<DiffPageProps> = ({ repoPath, onBack, branches }) => {
         if (isCancelled) return;
         setIsLoadingDiff(true);
         setDiffError(null);
-        return fetchDiffTree(repoPath, baseBranch, compareBranch, treeMode);
+        return fetchDiffTree(
+          repoPath,
+          baseBranch,
+          compareBranch,
+          treeMode,
+          skipReformatted
+        );
       })
       .then((data) => {
         if (isCancelled) return;
@@ -75,7 +82,7 @@ const DiffPage: FC<DiffPageProps> = ({ repoPath, onBack, branches }) => {
     return () => {
       isCancelled = true;
     };
-  }, [repoPath, baseBranch, compareBranch, treeMode]);
+  }, [repoPath, baseBranch, compareBranch, treeMode, skipReformatted]);
 
   const diffText = selectedNode?.source ?? "";
 
@@ -121,6 +128,8 @@ const DiffPage: FC<DiffPageProps> = ({ repoPath, onBack, branches }) => {
                 isLoading={isLoadingDiff}
                 viewMode={treeMode}
                 onViewModeChange={handleViewModeChange}
+                skipReformatted={skipReformatted}
+                onSkipReformattedChange={setSkipReformatted}
                 emptyMessage={
                   baseBranch && compareBranch
                     ? "No function or class changes found between these branches."
@@ -203,7 +212,9 @@ const DiffPage: FC<DiffPageProps> = ({ repoPath, onBack, branches }) => {
                   </div>
                 ) : (
                   <div className="mt-4 flex flex-1 items-center justify-center rounded-md border border-dashed border-muted-foreground/40 bg-muted/30 p-4 text-center text-xs text-muted-foreground">
-                    Diff preview will appear here.
+                    {selectedNode?.status === "reformatted"
+                      ? "Formatting-only change: no code changes to show."
+                      : "Diff preview will appear here."}
                   </div>
                 )}
               </div>
@@ -6,19 +6,22 @@ interface DiffTreeRequestBody {
     base_branch: string;
     compare_branch: string;
     tree_mode: "flat" | "tree";
+    skip_reformatted?: boolean;
 }
 
 async function fetchDiffTree(
     repoPath: string,
     baseBranch: string,
     compareBranch: string,
-    treeMode?: "flat" | "tree"
+    treeMode?: "flat" | "tree",
+    skipReformatted?: boolean
 ): Promise<ProjectTreeNode[]> {
     const body: DiffTreeRequestBody = {
         repo_path: repoPath,
         base_branch: baseBranch,
         compare_branch: compareBranch,
         tree_mode: treeMode ?? "flat",
+        skip_reformatted: skipReformatted ?? false,
     };
 
     return api<ProjectTreeNode[]>("/diff-tree", {
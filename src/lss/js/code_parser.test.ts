@@ -0,0 +1,62 @@
+import { describe, expect, test } from "bun:test";
+import { FILE_FINGERPRINT_KEY, parseCode } from "./code_parser";
+
+function fingerprint(code: string, name = "f"): string | undefined {
+    return parseCode(code)[name]?.fingerprint;
+}
+
+describe("tokenFingerprint", () => {
+    test("ignores layout, comments, quote style and trailing commas", () => {
+        expect(fingerprint("function f(a, b) { return g('x', [a, b]); }")).toBe(
+            fingerprint(
+                [
+                    "function f(",
+                    "    a,",
+                    "    b,",
+                    ") {",
+                    "    // call g",
+                    '    return g("x", [a, b,]);',
+                    "}",
+                ].join("\n")
+            )
+        );
+    });
+
+    test("keeps line breaks after return (ASI)", () => {
+        expect(fingerprint("function f() { return\nx; }")).not.toBe(
+            fingerprint("function f() { return x; }")
+        );
+    });
+
+    test("keeps line breaks before ++/-- (ASI)", () => {
+        expect(fingerprint("function f() { a\n++b; }")).not.toBe(
+            fingerprint("function f() { a++\nb; }")
+        );
+    });
+
+    test("keeps commas that are array holes", () => {
+        expect(fingerprint("function f() { return [,]; }")).not.toBe(
+            fingerprint("function f() { return []; }")
+        );
+        expect(fingerprint("function f() { return [a,,]; }")).not.toBe(
+            fingerprint("function f() { return [a,]; }")
+        );
+    });
+
+    test("whole-file fingerprint covers code outside definitions", () => {
+        const fileFingerprint = (code: string) =>
+            fingerprint(code, FILE_FINGERPRINT_KEY);
+        expect(fileFingerprint("const X = 1;\nfunction f() {}")).not.toBe(
+            fileFingerprint("const X = 2;\nfunction f() {}")
+        );
+        expect(fileFingerprint("const X = 1;\nfunction f() {}")).toBe(
+            fileFingerprint("const X = 1;\n\nfunction f() {\n}\n")
+        );
+    });
+
+    test("detects real changes", () => {
+        expect(fingerprint("function f() { return a + b; }")).not.toBe(
+            fingerprint("function f() { return a - b; }")
+        );
+    });
+});
@@ -1,6 +1,16 @@
 import { parse } from "@babel/parser";
 import traverse, { NodePath } from "@babel/traverse";
 import * as t from "@babel/types";
+import { createHash } from "node:crypto";
+
+// Reserved structure key holding the whole-file fingerprint. It can't
+// collide with a qualified name since "<" is not valid in identifiers.
+export const FILE_FINGERPRINT_KEY = "<file>";
+
+interface FileMeta {
+    type: "file";
+    fingerprint: string;
+}
 
 interface NodeMeta {
     type: "function" | "class";
@@ -9,6 +19,109 @@ interface NodeMeta {
     end_line: number;
     start_column: number;
     end_column: number;
+    fingerprint: string;
+}
+
+// A comma directly before one of these is a trailing comma that
+// formatters add or remove freely.
+const CLOSING_BRACKETS = new Set([")", "]", "}"]);
+
+// A line break after these tokens ends the statement (restricted
+// productions), so `return\nx` is not the same as `return x`.
+const NO_LINE_BREAK_AFTER = new Set([
+    "return",
+    "throw",
+    "break",
+    "continue",
+    "yield",
+    "async",
+]);
+
+// A line break before these makes them prefix rather than postfix
+// operators.
+const NO_LINE_BREAK_BEFORE = new Set(["++", "--"]);
+
+const LINE_BREAK = /[\n\r\u2028\u2029]/;
+
+function isComment(token: any): boolean {
+    return token.type === "CommentLine" || token.type === "CommentBlock";
+}
+
+/**
+ * Layout-independent text of a token. String literals are re-quoted from
+ * their value so that 'x' and "x" compare equal.
+ */
+function tokenText(token: any, code: string): string {
+    if (token.type?.label === "string") {
+        return JSON.stringify(token.value);
+    }
+    return code.slice(token.start, token.end);
+}
+
+/**
+ * Index of the first token whose start offset is >= `offset`.
+ */
+function lowerBound(tokens: any[], offset: number): number {
+    let lo = 0;
+    let hi = tokens.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (tokens[mid].start < offset) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return lo;
+}
+
+/**
+ * Whitespace- and comment-insensitive fingerprint of the tokens in
+ * [start, end). Definitions that only differ in layout, comments, quote
+ * style or trailing commas get the same fingerprint.
+ *
+ * Line breaks are kept where automatic semicolon insertion makes them
+ * significant, and a comma is only dropped when it follows an element
+ * (`[,]` is an array with a hole, not `[]`).
+ */
+function tokenFingerprint(
+    tokens: any[],
+    code: string,
+    start: number,
+    end: number
+): string {
+    const lo = lowerBound(tokens, start);
+    const hi = lowerBound(tokens, end);
+    const parts: string[] = [];
+    let prevText: string | null = null;
+    for (let i = lo; i < hi; i++) {
+        const text = tokenText(tokens[i], code);
+        if (
+            text === "," &&
+            i + 1 < hi &&
+            CLOSING_BRACKETS.has(tokenText(tokens[i + 1], code)) &&
+            prevText !== null &&
+            prevText !== "," &&
+            prevText !== "[" &&
+            prevText !== "(" &&
+            prevText !== "{"
+        ) {
+            prevText = text;
+            continue;
+        }
+        if (
+            i > lo &&
+            prevText !== null &&
+            (NO_LINE_BREAK_AFTER.has(prevText) ||
+                NO_LINE_BREAK_BEFORE.has(text)) &&
+            LINE_BREAK.test(code.slice(tokens[i - 1].end, tokens[i].start))
+        ) {
+            parts.push("\n");
+        }
+        parts.push(text);
+        prevText = text;
+    }
+    return createHash("sha1").update(parts.join("\u0000")).digest("hex");
 }
 
 /**
@@ -41,15 +154,17 @@ function getNodeName(path: NodePath): string {
 /**
  * A direct TypeScript/Babel equivalent of the provided Python AST parser.
  */
-export function parseCode(code: string): Record<string, NodeMeta> {
-    const structure: Record<string, NodeMeta> = {};
+export function parseCode(code: string): Record<string, NodeMeta | FileMeta> {
+    const structure: Record<string, NodeMeta | FileMeta> = {};
     if (!code.trim()) return structure;
 
     const ast = parse(code, {
         sourceType: "module",
         plugins: ["typescript", "jsx"],
         errorRecovery: true,
+        tokens: true,
     });
+    const tokens = (ast.tokens ?? []).filter((token: any) => !isComment(token));
 
     /**
      * This is the equivalent of the Python `visit` function. It's a visitor
@@ -76,6 +191,7 @@ export function parseCode(code: string): Record<string, NodeMeta> {
                 end_line: loc?.end.line ?? 0,
                 start_column: loc?.start.column ?? 0,
                 end_column: loc?.end.column ?? 0,
+                fingerprint: tokenFingerprint(tokens, code, start ?? 0, end ?? 0),
             };
 
             // Recurse into children with the updated parent context.
@@ -91,5 +207,10 @@ export function parseCode(code: string): Record<string, NodeMeta> {
     // This is the equivalent of the initial `visit(tree, [])` call.
     traverse(ast, visitor, undefined, { parents: [] });
 
+    structure[FILE_FINGERPRINT_KEY] = {
+        type: "file",
+        fingerprint: tokenFingerprint(tokens, code, 0, code.length),
+    };
+
     return structure;
 }
\ No newline at end of file
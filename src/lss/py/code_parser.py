@@ -1,5 +1,144 @@
 import ast
-from typing import Dict
+import bisect
+import hashlib
+import io
+import keyword
+import tokenize
+from typing import Dict, Optional
+
+# Reserved structure key holding the whole-file fingerprint. It can't
+# collide with a qualified name since "<" is not valid in identifiers.
+FILE_FINGERPRINT_KEY = "<file>"
+
+_OPENING_BRACKETS = {"(", "[", "{"}
+_CLOSING_BRACKETS = {")", "]", "}"}
+
+# Tokens after which "{" opens an f-string replacement field, where a
+# trailing comma turns the value into a tuple.
+_FSTRING_TOKENS = {
+    getattr(tokenize, name)
+    for name in ("FSTRING_START", "FSTRING_MIDDLE")
+    if hasattr(tokenize, name)
+}
+
+# Tokens that carry no meaning beyond layout.
+_LAYOUT_TOKENS = {
+    tokenize.COMMENT,
+    tokenize.NL,
+    tokenize.ENCODING,
+    tokenize.ENDMARKER,
+}
+
+
+def _normalize_token(tok: tokenize.TokenInfo) -> str:
+    """Return a layout-independent representation of a single token."""
+    if tok.type in (tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT):
+        # Keep block structure, but not the exact indentation width.
+        return tokenize.tok_name[tok.type]
+    if tok.type == tokenize.STRING:
+        # Normalise quote style ('x' vs "x"); bytes/str prefixes survive
+        # the round trip through repr().
+        try:
+            return repr(ast.literal_eval(tok.string))
+        except (ValueError, SyntaxError):
+            return tok.string
+    return tok.string
+
+
+def _single_trailing_comma_is_layout(
+    opener: str, prev: Optional[tokenize.TokenInfo]
+) -> bool:
+    """
+    Return True if ``opener(x,)`` means the same as ``opener(x)``.
+
+    That holds for call/parameter lists (``f(a,)``), list displays
+    (``[a,]``) and dict/set displays (``{a,}``), but not for grouping
+    parentheses (``(a,)`` is a tuple), subscripts (``x[a,]`` indexes with
+    a tuple) or f-string replacement fields.
+    """
+    follows_operand = prev is not None and (
+        (
+            prev.type == tokenize.NAME
+            and not keyword.iskeyword(prev.string)
+        )
+        or prev.string in (")", "]")
+        or prev.type == tokenize.STRING
+    )
+    if opener == "(":
+        return follows_operand
+    if opener == "[":
+        return not follows_operand
+    return prev is None or (
+        prev.type not in _FSTRING_TOKENS and prev.string not in (":", "!")
+    )
+
+
+def _fingerprint(tokens: list[tokenize.TokenInfo]) -> str:
+    """
+    Hash a token stream (without layout tokens) into a fingerprint.
+
+    Trailing commas are dropped only where they cannot change meaning:
+    when the bracket already holds another comma at the same depth, or
+    when a single trailing comma is insignificant for that bracket kind.
+    """
+    parts: list[str] = []
+    # One [comma_count, single_trailing_comma_is_layout] per open bracket.
+    stack: list[list] = []
+    prev: Optional[tokenize.TokenInfo] = None
+    for i, tok in enumerate(tokens):
+        if tok.type == tokenize.OP:
+            if tok.string in _OPENING_BRACKETS:
+                stack.append(
+                    [0, _single_trailing_comma_is_layout(tok.string, prev)]
+                )
+            elif tok.string in _CLOSING_BRACKETS:
+                if stack:
+                    stack.pop()
+            elif tok.string == "," and stack:
+                frame = stack[-1]
+                frame[0] += 1
+                is_trailing = (
+                    i + 1 < len(tokens)
+                    and tokens[i + 1].string in _CLOSING_BRACKETS
+                )
+                if is_trailing and (frame[0] > 1 or frame[1]):
+                    prev = tok
+                    continue
+        parts.append(_normalize_token(tok))
+        prev = tok
+    return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+def _token_fingerprints(
+    code: str, spans: Dict[str, tuple[int, int]]
+) -> Dict[str, str]:
+    """
+    Compute a whitespace- and comment-insensitive fingerprint per span.
+
+    ``spans`` maps qualified names to ``(start_line, end_line)``. Two
+    definitions that only differ in layout, comments, quote style or
+    insignificant trailing commas get the same fingerprint. The
+    fingerprint of the whole file is returned under
+    ``FILE_FINGERPRINT_KEY``.
+    """
+    try:
+        tokens = [
+            tok
+            for tok in tokenize.generate_tokens(io.StringIO(code).readline)
+            if tok.type not in _LAYOUT_TOKENS
+        ]
+    except (tokenize.TokenError, SyntaxError):
+        return {}
+
+    starts = [tok.start for tok in tokens]
+    fingerprints: Dict[str, str] = {FILE_FINGERPRINT_KEY: _fingerprint(tokens)}
+    for qualname, (start_line, end_line) in spans.items():
+        # Whole lines are used because AST columns are UTF-8 byte offsets
+        # while token columns are character offsets.
+        lo = bisect.bisect_left(starts, (start_line, 0))
+        hi = bisect.bisect_left(starts, (end_line + 1, 0), lo)
+        fingerprints[qualname] = _fingerprint(tokens[lo:hi])
+    return fingerprints
 
 
 def parse_code(code: str) -> Dict[str, dict]:
@@ -14,6 +153,9 @@ def parse_code(code: str) -> Dict[str, dict]:
     - ``Foo``          – top‑level class
     - ``Foo.bar``      – method ``bar`` inside class ``Foo``
     - ``main.inner``   – nested function ``inner`` inside ``main``
+
+    Each definition carries a layout-insensitive ``fingerprint``; the
+    fingerprint of the whole file is stored under ``FILE_FINGERPRINT_KEY``.
     """
     structure: Dict[str, dict] = {}
     if not code:
@@ -56,8 +198,25 @@ def parse_code(code: str) -> Dict[str, dict]:
 
         visit(tree, [])
 
-    except (SyntaxError, TypeError):
-        # Gracefully handle files that are not valid Python
+        fingerprints = _token_fingerprints(
+            code,
+            {
+                qualname: (info["start_line"], info["end_line"])
+                for qualname, info in structure.items()
+            },
+        )
+        file_fingerprint = fingerprints.pop(FILE_FINGERPRINT_KEY, None)
+        for qualname, fingerprint in fingerprints.items():
+            structure[qualname]["fingerprint"] = fingerprint
+        if file_fingerprint is not None:
+            structure[FILE_FINGERPRINT_KEY] = {
+                "type": "file",
+                "fingerprint": file_fingerprint,
+            }
+
+    except (SyntaxError, TypeError, ValueError, RecursionError, MemoryError):
+        # Gracefully handle files that are not valid Python, or that are
+        # too deeply nested / too large for the AST parser.
         pass
 
     return structure